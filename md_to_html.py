@@ -5,66 +5,78 @@ Markdown转HTML转换器
 自动读取md文件并生成对应的HTML文件
 """
 
+import functools
+import io
 import re
-import os
-from pathlib import Path
 
-def convert_markdown_to_html(md_file_path, output_html_path=None):
+# 预编译的正则表达式
+_RE_ORDERED_LIST = re.compile(r'^\d+\.\s')
+# 行内格式标记的起始字符：数学公式、粗体/斜体、行内代码、图片、链接
+_RE_INLINE_MARKER = re.compile(r'[$*`!\[]')
+# 行内格式的正则片段，各格式之间的优先级与原先逐遍替换一致：
+# 数学公式最先识别，粗体、斜体、图片、链接的内容把完整的公式当作整体跳过，公式里的*、]、)不会提前结束外层格式；
+# 粗体先于斜体，斜体内容中可以包含完整的粗体，但斜体不能在粗体的**上开始或结束
+_MATH_BODY = r'(?=[^$]*[+\-*/=<>^_{}\\α-ωΑ-Ω])[^$]+'  # 包含数学符号、希腊字母、上下标等才视为公式
+_MATH_PATTERN = rf'\${_MATH_BODY}\$'
+_PLAIN_DOLLAR = rf'(?!{_MATH_PATTERN})\$'  # 不构成公式的$按普通字符处理
+_STRONG_BODY = rf'(?:{_MATH_PATTERN}|[^*$]|{_PLAIN_DOLLAR})+'
+_EM_BODY = rf'(?:{_MATH_PATTERN}|\*\*{_STRONG_BODY}\*\*|[^*$]|{_PLAIN_DOLLAR})+'
+_EM_END = rf'\*(?!\*{_STRONG_BODY}\*\*)'
+
+def _span_pattern(stop, special, name):
     """
-    将Markdown文件转换为HTML文件
+    生成图片、链接内容的正则片段：不含stop中字符的普通文本与special片段交替出现
     
-    Args:
-        md_file_path (str): Markdown文件路径
-        output_html_path (str): 输出HTML文件路径，如果为None则自动生成
+    普通文本段用"(?=(?P<名>...))(?P=名)"模拟原子分组，一次吃完，匹配失败时不再逐字符回溯，
+    避免未闭合的标记造成立方级回溯；同一正则中分组名不能重复，由name区分
     """
-    
-    # 读取Markdown文件
-    try:
-        with open(md_file_path, 'r', encoding='utf-8') as f:
-            md_content = f.read()
-    except FileNotFoundError:
-        print(f"错误：找不到文件 {md_file_path}")
-        return False
-    except Exception as e:
-        print(f"读取文件时出错：{e}")
-        return False
-    
-    # 如果没有指定输出路径，自动生成
-    if output_html_path is None:
-        md_path = Path(md_file_path)
-        output_html_path = md_path.parent / f"{md_path.stem}.html"
-    
-    # 获取文件名作为标题
-    md_path = Path(md_file_path)
-    title = md_path.stem
-    
-    # 转换Markdown为HTML
-    html_content = markdown_to_html(md_content, title)
-    
-    # 写入HTML文件
-    try:
-        with open(output_html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print(f"成功生成HTML文件：{output_html_path}")
-        return True
-    except Exception as e:
-        print(f"写入HTML文件时出错：{e}")
-        return False
+    run = r'(?=(?P<{0}>[^{1}]*))(?P={0})'
+    return rf'{run.format(name, stop)}(?:(?:{special}){run.format(name + "_", stop)})*'
 
-def markdown_to_html(md_content, title="转换结果"):
+def _image_pattern(name):
     """
-    将Markdown内容转换为HTML内容
-    
-    Args:
-        md_content (str): Markdown内容
-        title (str): HTML页面标题
-        
-    Returns:
-        str: HTML内容
+    生成图片的正则片段，alt、src分组名以name为前缀
     """
-    
-    # HTML模板开始
-    html_template_start = '''<!DOCTYPE html>
+    alt = _span_pattern(r'\]$', rf'{_MATH_PATTERN}|{_PLAIN_DOLLAR}', name + 'a')
+    src = _span_pattern(r')$', rf'{_MATH_PATTERN}|{_PLAIN_DOLLAR}', name + 's')
+    return rf'!\[(?P<{name}alt>{alt})\]\((?P<{name}src>(?=[^)]){src})\)'
+
+# 链接文字里的"!["只能作为完整图片的开头（如徽章链接）：不成图片的"!["之后必然先遇到"]"而不是"]("，
+# 链接本来也无法匹配，因此不必对每个字符都向后预查整张图片
+_LINK_TEXT = _span_pattern(r'\]!$', rf'{_image_pattern("n")}|{_MATH_PATTERN}|!(?!\[)|{_PLAIN_DOLLAR}', 't')
+_LINK_HREF = _span_pattern(r')$', rf'{_MATH_PATTERN}|{_PLAIN_DOLLAR}', 'h')
+# 行内格式：各分支合并为一个正则，一次扫描完成，由命中的分组决定生成的HTML
+# （图片、链接的最后一个分组分别为src、href，lastgroup据此区分）
+_RE_INLINE = re.compile(rf'''
+    \$(?P<math>{_MATH_BODY})\$                              # 行内数学公式
+  | \*\*(?P<strong>{_STRONG_BODY})\*\*                      # 粗体
+  | \*(?P<em>{_EM_BODY}){_EM_END}                           # 斜体
+  | `(?P<code>[^`]+)`                                       # 行内代码
+  | {_image_pattern("")}                                    # 图片
+  | \[(?P<text>(?=[^\]]){_LINK_TEXT})\]\((?P<href>(?=[^)]){_LINK_HREF})\)   # 链接
+''', re.VERBOSE)
+_RE_ID_CLEAN = re.compile(r'[^\w\u4e00-\u9fff]+')
+# 块级分派：代码块、数学公式块、标题、无序列表、表格、有序列表、引用、空行
+# 各分支与逐个strip()后判断前缀的写法等价（列表标记后须有非空白内容）
+_RE_DISPATCH = re.compile(r'(?P<code>```)|(?P<math>\s*\$\$)|(?P<head>#+)|(?P<ul>\s*[-*] \s*\S)'
+                          r'|(?P<table>\s*\|(?:.*\|)?\s*$)|(?P<ol>\s*\d+\.\s+\S)|(?P<quote>\s*>)|(?P<blank>\s*$)')
+# 段落终止行：空行、标题、无序/有序列表、引用、代码块
+_RE_BLOCK_START = re.compile(r'^(?:\s*$|#|\s*[-*] \s*\S|\s*\d+\.\s+\S|\s*>|```)')
+# 表格单元格：两个竖线之间去掉首尾空白的内容
+_RE_TABLE_CELL = re.compile(r'\|\s*([^|\n]*?)\s*(?=\|)')
+# 图片的内联样式
+_IMG_STYLE = 'max-width: 100%; height: auto; display: block; margin: 20px auto; border: 1px solid #ddd; border-radius: 5px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);'
+# HTML特殊字符转义表
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;',
+})
+
+# HTML模板开始（{title}为页面标题占位符）
+_HTML_HEAD = '''<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
@@ -258,19 +270,19 @@ def markdown_to_html(md_content, title="转换结果"):
 </head>
 <body>
 '''
-    
-    # HTML模板结束
-    html_template_end = '''
+
+# HTML模板结束（不经过format，大括号无需转义，按JavaScript原样书写）
+_HTML_TAIL = '''
     <script>
         // 页面加载完成后重新渲染数学公式
-        window.addEventListener('load', function() {{
-            if (window.MathJax) {{
+        window.addEventListener('load', function() {
+            if (window.MathJax) {
                 MathJax.typesetPromise();
-            }}
-        }});
+            }
+        });
         
         // 生成目录
-        function generateTOC() {{
+        function generateTOC() {
             const headings = document.querySelectorAll('h1, h2, h3, h4, h5, h6');
             const toc = document.createElement('div');
             toc.className = 'toc';
@@ -281,39 +293,114 @@ def markdown_to_html(md_content, title="转换结果"):
             
             const tocList = document.createElement('ul');
             
-            headings.forEach((heading, index) => {{
+            headings.forEach((heading, index) => {
                 // 为标题添加ID
-                if (!heading.id) {{
-                    heading.id = `heading-${{index}}`;
-                }}
+                if (!heading.id) {
+                    heading.id = `heading-${index}`;
+                }
                 
                 const listItem = document.createElement('li');
                 const link = document.createElement('a');
-                link.href = `#${{heading.id}}`;
+                link.href = `#${heading.id}`;
                 link.textContent = heading.textContent;
                 
                 // 根据标题级别设置缩进
                 const level = parseInt(heading.tagName.charAt(1));
-                listItem.style.marginLeft = `${{(level - 1) * 20}}px`;
+                listItem.style.marginLeft = `${(level - 1) * 20}px`;
                 
                 listItem.appendChild(link);
                 tocList.appendChild(listItem);
-            }});
+            });
             
             toc.appendChild(tocList);
             
             // 在第一个h1后插入目录
             const firstH1 = document.querySelector('h1');
-            if (firstH1 && firstH1.nextSibling) {{
+            if (firstH1 && firstH1.nextSibling) {
                 firstH1.parentNode.insertBefore(toc, firstH1.nextSibling);
-            }}
-        }}
+            }
+        }
         
         // 页面加载完成后生成目录
         document.addEventListener('DOMContentLoaded', generateTOC);
     </script>
 </body>
 </html>'''
+
+def convert_markdown_to_html(md_file_path, output_html_path=None):
+    """
+    将Markdown文件转换为HTML文件
+    
+    Args:
+        md_file_path (str): Markdown文件路径
+        output_html_path (str): 输出HTML文件路径，如果为None则自动生成
+        
+    Returns:
+        bool: 是否成功；需要生成的HTML内容时请使用convert_markdown_file
+    """
+    
+    success, _ = convert_markdown_file(md_file_path, output_html_path)
+    return success
+
+def convert_markdown_file(md_file_path, output_html_path=None):
+    """
+    将Markdown文件转换为HTML文件，并返回生成的HTML内容
+    
+    Args:
+        md_file_path (str): Markdown文件路径
+        output_html_path (str): 输出HTML文件路径，如果为None则自动生成
+        
+    Returns:
+        tuple: (是否成功, 生成的HTML内容)，读取失败时HTML内容为None，
+            调用方可直接使用返回的HTML而无需重新读取输出文件
+    """
+    # 只有读写文件时才需要pathlib，延迟导入以加快仅做字符串转换时的模块加载
+    from pathlib import Path
+    
+    # 读取Markdown文件
+    try:
+        with open(md_file_path, 'r', encoding='utf-8') as f:
+            md_content = f.read()
+    except FileNotFoundError:
+        print(f"错误：找不到文件 {md_file_path}")
+        return False, None
+    except Exception as e:
+        print(f"读取文件时出错：{e}")
+        return False, None
+    
+    # 如果没有指定输出路径，自动生成
+    md_path = Path(md_file_path)
+    if output_html_path is None:
+        output_html_path = md_path.parent / f"{md_path.stem}.html"
+    
+    # 获取文件名作为标题
+    title = md_path.stem
+    
+    # 转换Markdown为HTML
+    html_content = markdown_to_html(md_content, title)
+    
+    # 写入HTML文件（一次性编码后以二进制写入，绕过文本模式的增量编码）
+    data = html_content.encode('utf-8')
+    try:
+        with open(output_html_path, 'wb', buffering=1 << 17) as f:
+            f.write(data)
+        print(f"成功生成HTML文件：{output_html_path}")
+        return True, html_content
+    except Exception as e:
+        print(f"写入HTML文件时出错：{e}")
+        return False, html_content
+
+def markdown_to_html(md_content: str, title: str = "转换结果") -> str:
+    """
+    将Markdown内容转换为HTML内容
+    
+    Args:
+        md_content (str): Markdown内容
+        title (str): HTML页面标题
+        
+    Returns:
+        str: HTML内容
+    """
     
     # 开始转换
     html_body = convert_md_to_html_body(md_content)
@@ -323,16 +410,9 @@ def markdown_to_html(md_content, title="转换结果"):
     html_body = html.unescape(html_body)
     
     # 组合完整HTML，插入标题
-    full_html = html_template_start.format(title=title) + html_body + html_template_end
-    
-    # 修复JavaScript模板字符串中的双大括号问题
-    full_html = full_html.replace('heading-${{index}}', 'heading-${index}')
-    full_html = full_html.replace('#${{heading.id}}', '#${heading.id}')
-    full_html = full_html.replace('`${{(level - 1) * 20}}px`', '`${(level - 1) * 20}px`')
-    
-    return full_html
+    return _HTML_HEAD.format(title=title) + html_body + _HTML_TAIL
 
-def convert_md_to_html_body(md_content):
+def convert_md_to_html_body(md_content: str) -> str:
     """
     将Markdown内容转换为HTML body内容
     
@@ -343,193 +423,205 @@ def convert_md_to_html_body(md_content):
         str: HTML body内容
     """
     
-    lines = md_content.split('\n')
-    html_lines = []
+    # splitlines同时兼容\r\n换行，且不会因文件末尾换行多出一个空行
+    lines = md_content.splitlines()
+    n = len(lines)
+    buf = io.StringIO()
+    # 绑定为局部变量，省去循环中每次对buf.write的属性查找
+    write = buf.write
     in_code_block = False
     in_math_block = False
     code_language = ''
     
     i = 0
-    while i < len(lines):
+    while i < n:
         line = lines[i]
+        stripped = line.strip()
+        # 一次匹配确定当前行的块级类型
+        block = _RE_DISPATCH.match(line)
+        kind = block.lastgroup if block else None
         
         # 处理代码块
-        if line.startswith('```'):
+        if kind == 'code':
             if not in_code_block:
                 in_code_block = True
                 code_language = line[3:].strip()
-                html_lines.append(f'<pre><code class="language-{code_language}">')
+                write(f'<pre><code class="language-{code_language}">\n')
             else:
                 in_code_block = False
-                html_lines.append('</code></pre>')
+                write('</code></pre>\n')
             i += 1
             continue
         
         if in_code_block:
-            html_lines.append(escape_html(line))
+            write(escape_html(line) + '\n')
             i += 1
             continue
         
         # 处理数学公式块
-        if line.strip().startswith('$$') and line.strip().endswith('$$') and len(line.strip()) > 4:
-            # 单行数学公式
-            math_content = line.strip()[2:-2]
-            html_lines.append(f'<div class="math-block">$${math_content}$$</div>')
-            i += 1
-            continue
-        elif line.strip() == '$$':
-            if not in_math_block:
-                in_math_block = True
-                html_lines.append('<div class="math-block">$$')
-            else:
-                in_math_block = False
-                html_lines.append('$$</div>')
-            i += 1
-            continue
+        if kind == 'math':
+            if stripped.endswith('$$') and len(stripped) > 4:
+                # 单行数学公式
+                math_content = stripped[2:-2]
+                write(f'<div class="math-block">$${math_content}$$</div>\n')
+                i += 1
+                continue
+            elif stripped == '$$':
+                if not in_math_block:
+                    in_math_block = True
+                    write('<div class="math-block">$$\n')
+                else:
+                    in_math_block = False
+                    write('$$</div>\n')
+                i += 1
+                continue
         
         if in_math_block:
-            html_lines.append(line)
+            write(line + '\n')
             i += 1
             continue
         
         # 处理标题
-        if line.startswith('#'):
-            level = 0
-            for char in line:
-                if char == '#':
-                    level += 1
-                else:
-                    break
-            
+        if kind == 'head':
+            level = len(line) - len(line.lstrip('#'))
             title_text = line[level:].strip()
             title_id = generate_id(title_text)
-            html_lines.append(f'<h{level} id="{title_id}">{process_inline_formatting(title_text)}</h{level}>')
+            write(f'<h{level} id="{title_id}">{process_inline_formatting(title_text)}</h{level}>\n')
             i += 1
             continue
         
         # 处理列表
-        if line.strip().startswith('- ') or line.strip().startswith('* '):
-            html_lines.append('<ul>')
-            while i < len(lines) and (lines[i].strip().startswith('- ') or lines[i].strip().startswith('* ')):
-                item_text = lines[i].strip()[2:]
-                html_lines.append(f'<li>{process_inline_formatting(item_text)}</li>')
+        if kind == 'ul':
+            write('<ul>\n')
+            while stripped.startswith('- ') or stripped.startswith('* '):
+                write('<li>')
+                write(process_inline_formatting(stripped[2:]))
+                write('</li>\n')
                 i += 1
-            html_lines.append('</ul>')
+                if i >= n:
+                    break
+                stripped = lines[i].strip()
+            write('</ul>\n')
             continue
         
         # 处理表格
-        if '|' in line and line.strip().startswith('|') and line.strip().endswith('|'):
+        if kind == 'table':
             table_lines = []
             # 收集表格行
-            while i < len(lines) and '|' in lines[i]:
+            while i < n and '|' in lines[i]:
                 table_lines.append(lines[i].strip())
                 i += 1
             
             if table_lines:
-                html_lines.append('<table>')
+                write('<table>\n')
                 
                 # 处理表头
                 if len(table_lines) > 0:
                     header_row = table_lines[0]
-                    headers = [cell.strip() for cell in header_row.split('|')[1:-1]]  # 去掉首尾空元素
-                    html_lines.append('<thead>')
-                    html_lines.append('<tr>')
+                    headers = _RE_TABLE_CELL.findall(header_row)
+                    write('<thead>\n<tr>\n')
                     for header in headers:
-                        html_lines.append(f'<th>{process_inline_formatting(header)}</th>')
-                    html_lines.append('</tr>')
-                    html_lines.append('</thead>')
+                        write(f'<th>{process_inline_formatting(header)}</th>\n')
+                    write('</tr>\n</thead>\n')
                 
                 # 处理表格数据（跳过分隔行）
                 data_start = 2 if len(table_lines) > 1 and '---' in table_lines[1] else 1
                 if len(table_lines) > data_start:
-                    html_lines.append('<tbody>')
+                    write('<tbody>\n')
                     for row_line in table_lines[data_start:]:
-                        cells = [cell.strip() for cell in row_line.split('|')[1:-1]]  # 去掉首尾空元素
-                        html_lines.append('<tr>')
+                        cells = _RE_TABLE_CELL.findall(row_line)
+                        write('<tr>\n')
                         for cell in cells:
-                            html_lines.append(f'<td>{process_inline_formatting(cell)}</td>')
-                        html_lines.append('</tr>')
-                    html_lines.append('</tbody>')
+                            write(f'<td>{process_inline_formatting(cell)}</td>\n')
+                        write('</tr>\n')
+                    write('</tbody>\n')
                 
-                html_lines.append('</table>')
+                write('</table>\n')
             continue
         
         # 处理有序列表
-        if re.match(r'^\d+\.\s', line.strip()):
-            html_lines.append('<ol>')
-            while i < len(lines):
-                current_line = lines[i].strip()
-                # 如果是有序列表项
-                if re.match(r'^\d+\.\s', current_line):
-                    item_text = re.sub(r'^\d+\.\s', '', current_line)
-                    item_content = [process_inline_formatting(item_text)]
-                    i += 1
-                    
-                    # 处理列表项的缩进内容（包括数学公式）
-                    while i < len(lines):
-                        next_line = lines[i]
-                        # 如果是空行
-                        if next_line.strip() == '':
-                            i += 1
-                            continue
-                        # 如果是缩进的内容（以空格开头）
-                        elif next_line.startswith('   ') or next_line.startswith('\t'):
-                            content = next_line.strip()
-                            # 处理数学公式
-                            if content.startswith('$$') and content.endswith('$$'):
-                                math_content = content[2:-2]
-                                item_content.append(f'<div class="math-block">$${math_content}$$</div>')
-                            else:
-                                item_content.append(process_inline_formatting(content))
-                            i += 1
-                        # 如果不是缩进内容，退出内容处理
-                        else:
-                            break
-                    
-                    html_lines.append(f'<li>{"".join(item_content)}</li>')
-                # 如果是空行，跳过并继续检查下一行
-                elif current_line == '':
-                    i += 1
-                    # 检查空行后是否还有有序列表项
-                    if i < len(lines) and re.match(r'^\d+\.\s', lines[i].strip()):
+        if kind == 'ol':
+            # 第一遍：线性扫描出每个列表项的文字及其附属行（空行和缩进内容）的范围
+            items: list[tuple[str, int, int]] = []
+            item_match = _RE_ORDERED_LIST.match(stripped)
+            while item_match:
+                item_text = stripped[item_match.end():]
+                body_start = i + 1
+                i = body_start
+                item_match = None
+                while i < n:
+                    next_line = lines[i]
+                    # 缩进的内容（以空格开头）属于当前列表项
+                    if next_line.startswith('   ') or next_line.startswith('\t'):
+                        i += 1
                         continue
-                    else:
-                        break
-                # 如果不是有序列表项也不是空行，结束列表
-                else:
+                    stripped = next_line.strip()
+                    # 空行跳过，继续检查下一行
+                    if stripped == '':
+                        i += 1
+                        continue
+                    # 既不是缩进内容也不是空行：若是新的列表项则继续扫描，否则列表结束
+                    item_match = _RE_ORDERED_LIST.match(stripped)
                     break
-            html_lines.append('</ol>')
+                items.append((item_text, body_start, i))
+            
+            # 第二遍：逐项生成HTML
+            write('<ol>\n')
+            for item_text, body_start, body_end in items:
+                # 列表项内容直接分段写入，不再先拼接成列表再join
+                write('<li>')
+                write(process_inline_formatting(item_text))
+                
+                # 处理列表项的缩进内容（包括数学公式）
+                for next_line in lines[body_start:body_end]:
+                    content = next_line.strip()
+                    if content == '':
+                        continue
+                    # 处理数学公式
+                    if content.startswith('$$') and content.endswith('$$'):
+                        write('<div class="math-block">$$')
+                        write(content[2:-2])
+                        write('$$</div>')
+                    else:
+                        write(process_inline_formatting(content))
+                
+                write('</li>\n')
+            write('</ol>\n')
             continue
         
         # 处理引用
-        if line.strip().startswith('>'):
-            html_lines.append('<blockquote>')
-            while i < len(lines) and lines[i].strip().startswith('>'):
-                quote_text = lines[i].strip()[1:].strip()
-                html_lines.append(f'<p>{process_inline_formatting(quote_text)}</p>')
+        if kind == 'quote':
+            write('<blockquote>\n')
+            while stripped.startswith('>'):
+                quote_text = stripped[1:].strip()
+                write(f'<p>{process_inline_formatting(quote_text)}</p>\n')
                 i += 1
-            html_lines.append('</blockquote>')
+                if i >= n:
+                    break
+                stripped = lines[i].strip()
+            write('</blockquote>\n')
             continue
         
         # 处理空行
-        if line.strip() == '':
-            html_lines.append('')
+        if kind == 'blank':
+            write('\n')
             i += 1
             continue
         
         # 处理普通段落
         paragraph_lines = []
-        while i < len(lines) and lines[i].strip() != '' and not lines[i].startswith('#') and not lines[i].strip().startswith('- ') and not lines[i].strip().startswith('* ') and not re.match(r'^\d+\.\s', lines[i].strip()) and not lines[i].strip().startswith('>') and not lines[i].startswith('```'):
+        while i < n and not _RE_BLOCK_START.match(lines[i]):
             paragraph_lines.append(lines[i])
             i += 1
         
         if paragraph_lines:
             paragraph_text = ' '.join(paragraph_lines)
-            html_lines.append(f'<p>{process_inline_formatting(paragraph_text)}</p>')
+            write(f'<p>{process_inline_formatting(paragraph_text)}</p>\n')
     
-    return '\n'.join(html_lines)
+    # 去掉末尾多写的一个换行符
+    return buf.getvalue()[:-1]
 
-def process_inline_formatting(text):
+def process_inline_formatting(text: str) -> str:
     """
     处理行内格式化（粗体、斜体、行内代码、行内数学公式等）
     
@@ -540,48 +632,45 @@ def process_inline_formatting(text):
         str: 处理后的HTML文本
     """
     
-    # 先保护数学公式，避免被其他格式化规则影响
-    math_placeholders = {}
-    math_counter = 0
-    
-    # 提取并保护行内数学公式
-    def protect_math(match):
-        nonlocal math_counter
-        placeholder = f'__MATH_PLACEHOLDER_{math_counter}__'
-        # 将$包围的数学公式转换为\(\)格式
-        math_content = match.group(1)
-        math_placeholders[placeholder] = f'\\({math_content}\\)'
-        math_counter += 1
-        return placeholder
-    
-    # 更精确的数学公式匹配：包含数学符号、希腊字母、上下标等
-    math_pattern = r'\$([^$]*(?:[+\-*/=<>^_{}\\]|\\[a-zA-Z]+|[α-ωΑ-Ω])[^$]*)\$'
-    text = re.sub(math_pattern, protect_math, text)
-    
-    # 处理粗体
-    text = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', text)
-    
-    # 处理斜体
-    text = re.sub(r'\*([^*]+)\*', r'<em>\1</em>', text)
-    
-    # 处理行内代码
-    text = re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
+    # 大多数文本不含任何标记字符，直接原样返回
+    if not _RE_INLINE_MARKER.search(text):
+        return text
     
-    # 处理图片（在链接之前处理，避免冲突）
-    text = re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', r'<img src="\2" alt="\1" style="max-width: 100%; height: auto; display: block; margin: 20px auto; border: 1px solid #ddd; border-radius: 5px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);" />', text)
-    
-    # 处理链接
-    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2">\1</a>', text)
+    return _RE_INLINE.sub(_replace_inline, text)
+
+def _replace_inline(match: "re.Match[str]") -> str:
+    """
+    根据命中的分组生成行内格式的HTML
     
-    # 恢复数学公式
-    for placeholder, math_content in math_placeholders.items():
-        text = text.replace(placeholder, math_content)
+    Args:
+        match (re.Match): _RE_INLINE的匹配结果
+        
+    Returns:
+        str: 替换后的HTML文本
+    """
     
-    return text
+    kind = match.lastgroup
+    
+    # 将$包围的数学公式转换为\(\)格式
+    if kind == 'math':
+        return f'\\({match.group("math")}\\)'
+    # 粗体、斜体的内容中可以继续嵌套其他行内格式
+    if kind == 'strong':
+        return f'<strong>{process_inline_formatting(match.group("strong"))}</strong>'
+    if kind == 'em':
+        return f'<em>{process_inline_formatting(match.group("em"))}</em>'
+    # 行内代码内容原样输出
+    if kind == 'code':
+        return f'<code>{match.group("code")}</code>'
+    if kind == 'src':
+        return f'<img src="{match.group("src")}" alt="{match.group("alt")}" style="{_IMG_STYLE}" />'
+    # 链接
+    return f'<a href="{match.group("href")}">{process_inline_formatting(match.group("text"))}</a>'
 
-def generate_id(text):
+@functools.lru_cache(maxsize=1024)
+def generate_id(text: str) -> str:
     """
-    为标题生成ID
+    为标题生成ID（结果按标题文本缓存，重复标题不再重新计算）
     
     Args:
         text (str): 标题文本
@@ -590,14 +679,13 @@ def generate_id(text):
         str: 生成的ID
     """
     
-    # 移除特殊字符，保留中文、英文、数字
-    clean_text = re.sub(r'[^\w\u4e00-\u9fff]', '-', text)
-    clean_text = re.sub(r'-+', '-', clean_text)
+    # 移除特殊字符（连续的特殊字符合并为一个连字符），保留中文、英文、数字
+    clean_text = _RE_ID_CLEAN.sub('-', text)
     clean_text = clean_text.strip('-')
     
     return clean_text.lower() if clean_text else 'heading'
 
-def escape_html(text):
+def escape_html(text: str) -> str:
     """
     转义HTML特殊字符
     
@@ -608,19 +696,14 @@ def escape_html(text):
         str: 转义后的文本
     """
     
-    text = text.replace('&', '&amp;')
-    text = text.replace('<', '&lt;')
-    text = text.replace('>', '&gt;')
-    text = text.replace('"', '&quot;')
-    text = text.replace("'", '&#39;')
-    
-    return text
+    return text.translate(_HTML_ESCAPE)
 
 def main():
     """
     主函数
     """
     import sys
+    from pathlib import Path
     
     # 设置文件路径
     current_dir = Path(__file__).parent
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+md_to_html 回归测试
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from md_to_html import convert_markdown_file, convert_markdown_to_html, process_inline_formatting
+
+
+class InlineFormattingTimingTest(unittest.TestCase):
+    """
+    行内格式化在病态输入下的耗时回归检查
+
+    原实现在这些输入上约0.02~0.1秒；立方级回溯时需要数秒，阈值留足余量
+    """
+
+    LIMIT = 1.0
+
+    def assert_fast(self, text):
+        start = time.perf_counter()
+        process_inline_formatting(text)
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, self.LIMIT, f'耗时{elapsed:.2f}秒')
+
+    def test_unclosed_images_in_link(self):
+        self.assert_fast('[' + '![' * 1000)
+        self.assert_fast('[' + '![' * 2000)
+
+    def test_paragraph_with_unclosed_images(self):
+        self.assert_fast('[ ' + 'see ![fig ' * 1000)
+
+    def test_unclosed_markers_for_every_branch(self):
+        n = 2000
+        for text in ('$' + '+a' * n, '**a' * n, '` ' * n, '![a' * n, '![a](' * n,
+                     '[a' * n, '[a](' * n, '[a' * n + '](', '[ ![ $+ ** `' * n):
+            with self.subTest(text=text[:12]):
+                self.assert_fast(text)
+
+    def test_badge_link_still_works(self):
+        html = process_inline_formatting('[![badge](img.svg)](http://x)')
+        self.assertTrue(html.startswith('<a href="http://x"><img src="img.svg" alt="badge"'))
+
+
+class InlineFormattingOutputTest(unittest.TestCase):
+    """
+    行内格式化的输出，优先级与原先逐遍替换一致
+    """
+
+    def assert_inline(self, text, expected):
+        self.assertEqual(process_inline_formatting(text), expected)
+
+    def test_bold_after_stray_asterisk(self):
+        self.assert_inline('A*B matrix, then **Q**', 'A*B matrix, then <strong>Q</strong>')
+        self.assert_inline('glob *.txt matches, **important**', 'glob *.txt matches, <strong>important</strong>')
+
+    def test_bold_inside_italic(self):
+        self.assert_inline('*a **b** c*', '<em>a <strong>b</strong> c</em>')
+
+    def test_math_with_asterisk_inside_emphasis(self):
+        self.assert_inline('*see $x*y$ here*', '<em>see \\(x*y\\) here</em>')
+        self.assert_inline('**$a*b$**', '<strong>\\(a*b\\)</strong>')
+
+    def test_code_span_verbatim(self):
+        self.assert_inline('`a*b*` and *c*', '<code>a*b*</code> and <em>c</em>')
+
+    def test_image_alt_verbatim(self):
+        html = process_inline_formatting('![*a* $x+1$](p.png)')
+        self.assertTrue(html.startswith('<img src="p.png" alt="*a* $x+1$" style="'))
+
+    def test_link_text_with_nested_markup(self):
+        self.assert_inline('[**a** $x+1$](u)', '<a href="u"><strong>a</strong> \\(x+1\\)</a>')
+
+
+class ConvertMarkdownFileTest(unittest.TestCase):
+    """
+    文件转换接口的返回值
+    """
+
+    def test_convert_markdown_to_html_returns_bool(self):
+        self.assertIs(convert_markdown_to_html('/nonexistent/missing.md'), False)
+
+    def test_convert_markdown_file_returns_html(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            md_path = os.path.join(tmp_dir, 'note.md')
+            with open(md_path, 'w', encoding='utf-8') as f:
+                f.write('# 标题\n')
+            success, html = convert_markdown_file(md_path)
+            self.assertTrue(success)
+            with open(os.path.join(tmp_dir, 'note.html'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), html)
+
+        self.assertEqual(convert_markdown_file('/nonexistent/missing.md'), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()